@@ -3,13 +3,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.core.models import TemplateCreateRequest, TemplateResponse
 from app.core.errors import TemplateNotFoundError
-from app.services.prompt_manager import PromptManager
+from app.api.routes import evaluate
 
 
 router = APIRouter(prefix="/v1/config", tags=["config"])
 
-# Service instances
-prompt_manager = PromptManager()
+# Service instances, shared with the evaluation routes so that template
+# changes apply to evaluations right away
+prompt_manager = evaluate.prompt_manager
 
 
 @router.get("/judge_templates", response_model=List[TemplateResponse])
@@ -56,7 +57,7 @@ async def create_judge_template(template_data: TemplateCreateRequest) -> Templat
     Returns:
         The created template
     """
-    template = prompt_manager.create_template(template_data.dict())
+    template = prompt_manager.create_template(template_data.model_dump())
     return TemplateResponse(**template)
 
 
@@ -76,7 +77,7 @@ async def update_judge_template(template_id: str, template_data: TemplateCreateR
         TemplateNotFoundError: If the template is not found
     """
     try:
-        template = prompt_manager.update_template(template_id, template_data.dict())
+        template = prompt_manager.update_template(template_id, template_data.model_dump())
         return TemplateResponse(**template)
     except TemplateNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
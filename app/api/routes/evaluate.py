@@ -1,19 +1,26 @@
 import uuid
 import asyncio
-from typing import Dict, Any, Optional
-from fastapi import APIRouter, Depends, BackgroundTasks
+from typing import AsyncIterator, Dict, Any, Optional, Union
+
+import orjson
+from fastapi import APIRouter, Depends, BackgroundTasks, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
 
 from app.core.models import (
     SingleEvaluationRequest,
     PairwiseComparisonRequest,
+    BatchEvaluationRequest,
+    BatchEvaluationResponse,
     EvaluationResponse,
     TaskStatus,
     EvaluationResult,
 )
+from app.core.config import settings
 from app.core.errors import TaskNotFoundError, TemplateNotFoundError
 from app.services.vllm_client import VLLMClient
 from app.services.prompt_manager import PromptManager
 from app.services.output_parser import OutputParser
+from app.services.request_coalescer import RequestCoalescer
 
 
 router = APIRouter(prefix="/v1/evaluate", tags=["evaluate"])
@@ -21,10 +28,97 @@ router = APIRouter(prefix="/v1/evaluate", tags=["evaluate"])
 # In-memory task storage (in a production environment, this would be a persistent store)
 evaluation_tasks: Dict[str, Dict[str, Any]] = {}
 
+# Conditions notified whenever a task changes, used for long-polling and streaming
+task_conditions: Dict[str, asyncio.Condition] = {}
+
+# Statuses after which a task no longer changes
+FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+
 # Service instances
 vllm_client = VLLMClient()
 prompt_manager = PromptManager()
 output_parser = OutputParser()
+request_coalescer = RequestCoalescer()
+
+
+async def update_task(evaluation_id: str, **fields: Any) -> None:
+    """
+    Update a task and wake up everything waiting on it.
+    
+    Args:
+        evaluation_id: ID of the evaluation task
+        fields: Task fields to update
+    """
+    evaluation_tasks[evaluation_id].update(fields)
+    condition = task_conditions[evaluation_id]
+    async with condition:
+        condition.notify_all()
+
+
+def get_task_response(evaluation_id: str) -> EvaluationResponse:
+    """
+    Build the API response for the current state of a task.
+    
+    Args:
+        evaluation_id: ID of the evaluation task
+        
+    Returns:
+        Evaluation response with current status and result if completed
+        
+    Raises:
+        TaskNotFoundError: If the task is not found
+    """
+    if evaluation_id not in evaluation_tasks:
+        raise TaskNotFoundError(evaluation_id)
+    
+    task = evaluation_tasks[evaluation_id]
+    return EvaluationResponse(
+        evaluation_id=task["evaluation_id"],
+        status=task["status"],
+        result=task["result"],
+        error_message=task["error_message"],
+    )
+
+
+async def watch_task(evaluation_id: str) -> AsyncIterator[EvaluationResponse]:
+    """
+    Yield the state of a task every time its status changes, until it finishes.
+    
+    Args:
+        evaluation_id: ID of the evaluation task
+        
+    Yields:
+        Evaluation response for each status the task goes through
+    """
+    condition = task_conditions[evaluation_id]
+    last_status = None
+    while last_status not in FINISHED_STATUSES:
+        async with condition:
+            await condition.wait_for(
+                lambda: evaluation_tasks[evaluation_id]["status"] != last_status
+            )
+            response = get_task_response(evaluation_id)
+        last_status = response.status
+        yield response
+
+
+def get_parser_rules(prompt_manager: PromptManager, prompt_template_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Get the output parser rules of the template used for an evaluation.
+    
+    Args:
+        prompt_manager: Instance of PromptManager
+        prompt_template_id: ID of the prompt template, if one was used
+        
+    Returns:
+        The template's parser rules, or None if no (existing) template was used
+    """
+    if not prompt_template_id:
+        return None
+    try:
+        return prompt_manager.get_template(prompt_template_id).get("output_parser_rules")
+    except TemplateNotFoundError:
+        return None
 
 
 async def process_single_evaluation(
@@ -46,7 +140,7 @@ async def process_single_evaluation(
     """
     try:
         # Update task status
-        evaluation_tasks[evaluation_id]["status"] = TaskStatus.RUNNING
+        await update_task(evaluation_id, status=TaskStatus.RUNNING)
         
         # Generate prompt
         messages = prompt_manager.generate_single_evaluation_prompt(
@@ -59,26 +153,23 @@ async def process_single_evaluation(
         )
         
         # Get sampling parameters
-        sampling_params = request.vllm_sampling_params.dict() if request.vllm_sampling_params else {}
+        sampling_params = request.vllm_sampling_params.model_dump() if request.vllm_sampling_params else {}
         
-        # Generate completion
-        response = await vllm_client.generate_completion(
-            model=request.judge_model_id,
-            messages=messages,
-            sampling_params=sampling_params,
+        # Generate completion, sharing it with identical requests already in flight
+        response = await request_coalescer.run(
+            request_coalescer.completion_key(request.judge_model_id, messages, sampling_params),
+            lambda: vllm_client.generate_completion(
+                model=request.judge_model_id,
+                messages=messages,
+                sampling_params=sampling_params,
+            ),
         )
         
         # Extract the response text
         raw_output = response["choices"][0]["message"]["content"]
         
         # Get parser rules if a template was used
-        parser_rules = None
-        if request.prompt_template_id:
-            try:
-                template = prompt_manager.get_template(request.prompt_template_id)
-                parser_rules = template.get("output_parser_rules")
-            except TemplateNotFoundError:
-                pass
+        parser_rules = get_parser_rules(prompt_manager, request.prompt_template_id)
         
         # Parse the output
         parsed_result = output_parser.parse_single_evaluation(
@@ -89,20 +180,22 @@ async def process_single_evaluation(
         )
         
         # Update task with result
-        evaluation_tasks[evaluation_id].update({
-            "status": TaskStatus.COMPLETED,
-            "result": EvaluationResult(
+        await update_task(
+            evaluation_id,
+            status=TaskStatus.COMPLETED,
+            result=EvaluationResult(
                 judgment=parsed_result["judgment"],
                 raw_judge_output=raw_output,
                 reasoning=parsed_result["reasoning"],
             ),
-        })
+        )
     except Exception as e:
         # Update task with error
-        evaluation_tasks[evaluation_id].update({
-            "status": TaskStatus.FAILED,
-            "error_message": str(e),
-        })
+        await update_task(
+            evaluation_id,
+            status=TaskStatus.FAILED,
+            error_message=str(e),
+        )
 
 
 async def process_pairwise_comparison(
@@ -124,7 +217,7 @@ async def process_pairwise_comparison(
     """
     try:
         # Update task status
-        evaluation_tasks[evaluation_id]["status"] = TaskStatus.RUNNING
+        await update_task(evaluation_id, status=TaskStatus.RUNNING)
         
         # Generate prompt
         messages = prompt_manager.generate_pairwise_comparison_prompt(
@@ -138,26 +231,23 @@ async def process_pairwise_comparison(
         )
         
         # Get sampling parameters
-        sampling_params = request.vllm_sampling_params.dict() if request.vllm_sampling_params else {}
+        sampling_params = request.vllm_sampling_params.model_dump() if request.vllm_sampling_params else {}
         
-        # Generate completion
-        response = await vllm_client.generate_completion(
-            model=request.judge_model_id,
-            messages=messages,
-            sampling_params=sampling_params,
+        # Generate completion, sharing it with identical requests already in flight
+        response = await request_coalescer.run(
+            request_coalescer.completion_key(request.judge_model_id, messages, sampling_params),
+            lambda: vllm_client.generate_completion(
+                model=request.judge_model_id,
+                messages=messages,
+                sampling_params=sampling_params,
+            ),
         )
         
         # Extract the response text
         raw_output = response["choices"][0]["message"]["content"]
         
         # Get parser rules if a template was used
-        parser_rules = None
-        if request.prompt_template_id:
-            try:
-                template = prompt_manager.get_template(request.prompt_template_id)
-                parser_rules = template.get("output_parser_rules")
-            except TemplateNotFoundError:
-                pass
+        parser_rules = get_parser_rules(prompt_manager, request.prompt_template_id)
         
         # Parse the output
         parsed_result = output_parser.parse_pairwise_comparison(
@@ -168,20 +258,22 @@ async def process_pairwise_comparison(
         )
         
         # Update task with result
-        evaluation_tasks[evaluation_id].update({
-            "status": TaskStatus.COMPLETED,
-            "result": EvaluationResult(
+        await update_task(
+            evaluation_id,
+            status=TaskStatus.COMPLETED,
+            result=EvaluationResult(
                 judgment=parsed_result["judgment"],
                 raw_judge_output=raw_output,
                 reasoning=parsed_result["reasoning"],
             ),
-        })
+        )
     except Exception as e:
         # Update task with error
-        evaluation_tasks[evaluation_id].update({
-            "status": TaskStatus.FAILED,
-            "error_message": str(e),
-        })
+        await update_task(
+            evaluation_id,
+            status=TaskStatus.FAILED,
+            error_message=str(e),
+        )
 
 
 @router.post("/single_response", response_model=EvaluationResponse)
@@ -209,6 +301,7 @@ async def evaluate_single_response(
         "result": None,
         "error_message": None,
     }
+    task_conditions[evaluation_id] = asyncio.Condition()
     
     # Process the evaluation in the background
     background_tasks.add_task(
@@ -252,6 +345,7 @@ async def pairwise_comparison(
         "result": None,
         "error_message": None,
     }
+    task_conditions[evaluation_id] = asyncio.Condition()
     
     # Process the evaluation in the background
     background_tasks.add_task(
@@ -270,13 +364,150 @@ async def pairwise_comparison(
     )
 
 
+@router.post("/batch", response_model=BatchEvaluationResponse)
+async def evaluate_batch(request: BatchEvaluationRequest) -> BatchEvaluationResponse:
+    """
+    Run several evaluations and comparisons, responding once all of them have finished.
+    
+    The judge calls of all items are sent to vLLM concurrently, so its continuous
+    batching can schedule them together. Each item is also registered as a
+    regular task, so its status stays available from the status endpoint.
+    
+    Args:
+        request: The batch of evaluation and comparison requests
+        
+    Returns:
+        The completed or failed evaluation of each item, in request order
+    """
+    evaluation_ids = []
+    jobs = []
+    for item in request.items:
+        # Generate a unique ID for this evaluation
+        evaluation_id = str(uuid.uuid4())
+        
+        # Create a new task
+        evaluation_tasks[evaluation_id] = {
+            "evaluation_id": evaluation_id,
+            "status": TaskStatus.PENDING,
+            "result": None,
+            "error_message": None,
+        }
+        task_conditions[evaluation_id] = asyncio.Condition()
+        
+        process = (
+            process_pairwise_comparison
+            if isinstance(item, PairwiseComparisonRequest)
+            else process_single_evaluation
+        )
+        evaluation_ids.append(evaluation_id)
+        jobs.append(process(evaluation_id, item, vllm_client, prompt_manager, output_parser))
+        
+    # Failures are recorded on the tasks, so the jobs themselves do not raise
+    await asyncio.gather(*jobs)
+    
+    return BatchEvaluationResponse(
+        results=[get_task_response(evaluation_id) for evaluation_id in evaluation_ids],
+    )
+
+
+@router.post("/stream")
+async def stream_evaluation(
+    request: Union[SingleEvaluationRequest, PairwiseComparisonRequest],
+) -> StreamingResponse:
+    """
+    Run an evaluation or comparison and stream the judge output as Server-Sent Events.
+    
+    A `token` event is sent for every piece of judge output as vLLM generates
+    it, followed by a `result` event with the parsed evaluation, or an `error`
+    event if it failed. A client that only needs the judgment can disconnect
+    as soon as it shows up in the tokens; this closes the request to vLLM,
+    which aborts the rest of the generation.
+    
+    Args:
+        request: The evaluation or comparison request
+        
+    Returns:
+        A text/event-stream response
+    """
+    # Generate the prompt up front, so template errors get a regular error response
+    if isinstance(request, PairwiseComparisonRequest):
+        messages = prompt_manager.generate_pairwise_comparison_prompt(
+            text_A=request.text_A,
+            text_B=request.text_B,
+            comparison_criteria=request.comparison_criteria,
+            prompt_template_id=request.prompt_template_id,
+            custom_prompt_segments=request.custom_prompt_segments,
+            output_format_instruction=request.output_format_instruction,
+            provide_reasoning=request.provide_reasoning,
+        )
+        parse_output = output_parser.parse_pairwise_comparison
+    else:
+        messages = prompt_manager.generate_single_evaluation_prompt(
+            text_to_evaluate=request.text_to_evaluate,
+            evaluation_criteria=request.evaluation_criteria,
+            prompt_template_id=request.prompt_template_id,
+            custom_prompt_segments=request.custom_prompt_segments,
+            output_format_instruction=request.output_format_instruction,
+            provide_reasoning=request.provide_reasoning,
+        )
+        parse_output = output_parser.parse_single_evaluation
+    
+    # Get sampling parameters
+    sampling_params = request.vllm_sampling_params.model_dump() if request.vllm_sampling_params else {}
+    
+    async def event_generator() -> AsyncIterator[str]:
+        chunks = []
+        try:
+            async for delta in vllm_client.stream_completion(
+                model=request.judge_model_id,
+                messages=messages,
+                sampling_params=sampling_params,
+            ):
+                chunks.append(delta)
+                yield f"event: token\ndata: {orjson.dumps({'delta': delta}).decode()}\n\n"
+            
+            raw_output = "".join(chunks)
+            parsed_result = parse_output(
+                raw_output=raw_output,
+                template_id=request.prompt_template_id,
+                parser_rules=get_parser_rules(prompt_manager, request.prompt_template_id),
+                provide_reasoning=request.provide_reasoning,
+            )
+            result = EvaluationResult(
+                judgment=parsed_result["judgment"],
+                raw_judge_output=raw_output,
+                reasoning=parsed_result["reasoning"],
+            )
+            yield f"event: result\ndata: {result.model_dump_json()}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {orjson.dumps({'error': str(e)}).decode()}\n\n"
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.get("/status/{evaluation_id}", response_model=EvaluationResponse)
-async def get_evaluation_status(evaluation_id: str) -> EvaluationResponse:
+async def get_evaluation_status(
+    evaluation_id: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=settings.STATUS_LONG_POLL_MAX_SECONDS,
+        description="Seconds to wait for the task to complete or fail before responding",
+    ),
+) -> EvaluationResponse:
     """
     Get the status of an evaluation task.
     
+    If wait is given, the request is held open until the task reaches a
+    terminal status or the wait expires, whichever comes first.
+    
     Args:
         evaluation_id: ID of the evaluation task
+        wait: Maximum number of seconds to wait for the task to finish
         
     Returns:
         Evaluation response with current status and result if completed
@@ -288,13 +519,74 @@ async def get_evaluation_status(evaluation_id: str) -> EvaluationResponse:
     if evaluation_id not in evaluation_tasks:
         raise TaskNotFoundError(evaluation_id)
     
-    # Get the task
-    task = evaluation_tasks[evaluation_id]
+    # Long-poll until the task finishes or the wait expires
+    if wait > 0:
+        condition = task_conditions[evaluation_id]
+        async with condition:
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(
+                        lambda: evaluation_tasks[evaluation_id]["status"] in FINISHED_STATUSES
+                    ),
+                    timeout=wait,
+                )
+            except asyncio.TimeoutError:
+                pass
     
-    # Return the response
-    return EvaluationResponse(
-        evaluation_id=task["evaluation_id"],
-        status=task["status"],
-        result=task["result"],
-        error_message=task["error_message"],
-    )
\ No newline at end of file
+    return get_task_response(evaluation_id)
+
+
+@router.get("/events/{evaluation_id}")
+async def stream_evaluation_events(evaluation_id: str) -> StreamingResponse:
+    """
+    Stream the status transitions of an evaluation task as Server-Sent Events.
+    
+    Each event carries the same payload as the status endpoint; the stream
+    ends once the task has completed or failed.
+    
+    Args:
+        evaluation_id: ID of the evaluation task
+        
+    Returns:
+        A text/event-stream response
+        
+    Raises:
+        TaskNotFoundError: If the task is not found
+    """
+    if evaluation_id not in evaluation_tasks:
+        raise TaskNotFoundError(evaluation_id)
+    
+    async def event_generator() -> AsyncIterator[str]:
+        async for update in watch_task(evaluation_id):
+            yield f"data: {update.model_dump_json()}\n\n"
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.websocket("/ws/{evaluation_id}")
+async def evaluation_websocket(websocket: WebSocket, evaluation_id: str) -> None:
+    """
+    Push the status transitions of an evaluation task over a WebSocket.
+    
+    Each message carries the same payload as the status endpoint; the socket
+    is closed once the task has completed or failed.
+    
+    Args:
+        websocket: The client connection
+        evaluation_id: ID of the evaluation task
+    """
+    if evaluation_id not in evaluation_tasks:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=f"Task not found: {evaluation_id}")
+        return
+    
+    await websocket.accept()
+    try:
+        async for update in watch_task(evaluation_id):
+            await websocket.send_text(update.model_dump_json())
+    except WebSocketDisconnect:
+        return
+    await websocket.close()
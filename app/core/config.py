@@ -1,12 +1,18 @@
 import os
 from typing import Dict, Any, Optional
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     """Application settings."""
+    model_config = SettingsConfigDict(env_file=".env")
+    
     APP_NAME: str = "vllm-detector-adapter"
     DEBUG: bool = False
     
+    # Server configuration
+    WORKERS: int = 1
+    CORS_ALLOW_ORIGINS: str = ""  # Comma-separated list of allowed browser origins
+    
     # vLLM Server configuration
     VLLM_API_BASE: str = os.getenv("VLLM_API_BASE", "http://localhost:8080/v1")
     VLLM_API_KEY: Optional[str] = os.getenv("VLLM_API_KEY", "")
@@ -14,6 +20,7 @@ class Settings(BaseSettings):
     # Adapter configuration
     DEFAULT_TIMEOUT: int = 60
     MAX_RETRY_ATTEMPTS: int = 3
+    COALESCE_MAX_TEMPERATURE: float = 0.1  # Identical concurrent requests at or below this temperature share one judge call
     TEMPLATE_STORAGE_PATH: str = os.getenv(
         "TEMPLATE_STORAGE_PATH", 
         os.path.join(os.path.dirname(__file__), "../templates/default_templates.json")
@@ -21,8 +28,7 @@ class Settings(BaseSettings):
     
     # Async task configuration
     TASK_EXPIRY_SECONDS: int = 3600  # 1 hour
-    
-    class Config:
-        env_file = ".env"
+    STATUS_LONG_POLL_MAX_SECONDS: int = 30
+    BATCH_MAX_ITEMS: int = 64  # Most evaluations accepted by one batch request
 
 settings = Settings()
@@ -2,6 +2,8 @@ from enum import Enum
 from typing import Dict, List, Optional, Union, Any
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+
 
 class TaskStatus(str, Enum):
     """Status of an evaluation task."""
@@ -69,6 +71,21 @@ class EvaluationResponse(BaseModel):
     error_message: Optional[str] = Field(None, description="Error message, if the evaluation failed")
 
 
+class BatchEvaluationRequest(BaseModel):
+    """Request model for running several evaluations in one call."""
+    items: List[Union[SingleEvaluationRequest, PairwiseComparisonRequest]] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BATCH_MAX_ITEMS,
+        description="Single evaluation and pairwise comparison requests to run together",
+    )
+
+
+class BatchEvaluationResponse(BaseModel):
+    """Response model for batch evaluation requests."""
+    results: List[EvaluationResponse] = Field(..., description="Final state of each evaluation, in the order of the request items")
+
+
 class TemplateCreateRequest(BaseModel):
     """Request model for creating a new prompt template."""
     template_name: str = Field(..., description="Name of the template")
@@ -1,25 +1,47 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
 #FIXME: ModuleNotFoundError: No module named 'app'
 from app.api.routes import evaluate, config
+from app.core.config import settings
 from app.core.errors import AdapterError
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled vLLM connections
+    await evaluate.vllm_client.aclose()
+
 app = FastAPI(
     title="vLLM Detector Adapter",
     description="A model-agnostic adapter for enabling LLM-as-a-judge detections and evaluations with vLLM-hosted models",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Adjust for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Compress larger responses, such as results with long judge reasoning.
+# Starlette >= 0.46 leaves text/event-stream responses uncompressed, so the
+# SSE endpoints keep delivering events as they happen
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Add CORS middleware only when browser origins are configured; a backend-only
+# deployment skips it and saves the per-request header handling. It is added last
+# so that it is the outermost middleware and answers preflights first
+cors_allow_origins = frozenset(
+    origin.strip() for origin in settings.CORS_ALLOW_ORIGINS.split(",") if origin.strip()
 )
+if cors_allow_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_allow_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["Content-Type", "Authorization"],
+    )
 
 # Include API routes
 app.include_router(evaluate.router)
@@ -40,4 +62,15 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    if settings.DEBUG:
+        # Single auto-reloading process for development
+        uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=settings.WORKERS,
+            loop="uvloop",
+            http="httptools",
+        )
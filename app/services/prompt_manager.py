@@ -8,6 +8,90 @@ from app.core.errors import PromptTemplateError, TemplateNotFoundError
 from app.core.models import CustomPromptSegments
 
 
+def render_single_evaluation_messages(
+    prompt_structure: Dict[str, str],
+    text_to_evaluate: str,
+    evaluation_criteria: str,
+    output_format_instruction: str,
+) -> List[Dict[str, str]]:
+    """
+    Render the chat messages for evaluating a single text.
+    
+    Args:
+        prompt_structure: The template's prompt structure, with any custom segments applied
+        text_to_evaluate: The text to evaluate
+        evaluation_criteria: Criteria for the evaluation
+        output_format_instruction: Instructions for the judge LLM on output format
+        
+    Returns:
+        A list of messages in the format expected by the vLLM server
+    """
+    user_content = prompt_structure["user_instruction_prefix"].format(
+        evaluation_criteria=evaluation_criteria,
+        output_format_instruction=output_format_instruction,
+    ) + text_to_evaluate
+    
+    if "user_instruction_suffix" in prompt_structure:
+        user_content += prompt_structure["user_instruction_suffix"].format(
+            output_format_instruction=output_format_instruction,
+        )
+        
+    return [
+        {
+            "role": "system",
+            "content": prompt_structure["system_message"],
+        },
+        {
+            "role": "user",
+            "content": user_content,
+        },
+    ]
+
+
+def render_pairwise_comparison_messages(
+    prompt_structure: Dict[str, str],
+    text_A: str,
+    text_B: str,
+    comparison_criteria: str,
+    output_format_instruction: str,
+) -> List[Dict[str, str]]:
+    """
+    Render the chat messages for comparing two texts.
+    
+    Args:
+        prompt_structure: The template's prompt structure, with any custom segments applied
+        text_A: First text to compare
+        text_B: Second text to compare
+        comparison_criteria: Criteria for the comparison
+        output_format_instruction: Instructions for the judge LLM on output format
+        
+    Returns:
+        A list of messages in the format expected by the vLLM server
+    """
+    user_content = prompt_structure["user_instruction_prefix"].format(
+        comparison_criteria=comparison_criteria,
+        text_A=text_A,
+        text_B=text_B,
+        output_format_instruction=output_format_instruction,
+    )
+    
+    if "user_instruction_suffix" in prompt_structure:
+        user_content += prompt_structure["user_instruction_suffix"].format(
+            output_format_instruction=output_format_instruction,
+        )
+        
+    return [
+        {
+            "role": "system",
+            "content": prompt_structure["system_message"],
+        },
+        {
+            "role": "user",
+            "content": user_content,
+        },
+    ]
+
+
 class PromptManager:
     """Manages prompt templates and their generation."""
     
@@ -224,49 +308,17 @@ class PromptManager:
             )
             
         # Use the provided template or default to binary classification
-        template = None
-        if prompt_template_id:
-            try:
-                template = self.get_template(prompt_template_id)["prompt_structure"]
-            except TemplateNotFoundError:
-                raise PromptTemplateError(f"Template not found: {prompt_template_id}")
-        else:
-            # Use the binary classification template
-            template = self.get_template("binary_classification")["prompt_structure"]
-            
-        # Override template segments with custom segments if provided
-        if custom_prompt_segments:
-            if custom_prompt_segments.system_message:
-                template["system_message"] = custom_prompt_segments.system_message
-            if custom_prompt_segments.user_instruction_prefix:
-                template["user_instruction_prefix"] = custom_prompt_segments.user_instruction_prefix
-            if custom_prompt_segments.user_instruction_suffix:
-                template["user_instruction_suffix"] = custom_prompt_segments.user_instruction_suffix
-                
-        # Format the prompt
-        user_content = template["user_instruction_prefix"].format(
-            evaluation_criteria=evaluation_criteria,
-            output_format_instruction=output_format_instruction,
-        ) + text_to_evaluate
+        prompt_structure = self._get_prompt_structure(
+            prompt_template_id or "binary_classification",
+            custom_prompt_segments,
+        )
         
-        if "user_instruction_suffix" in template:
-            user_content += template["user_instruction_suffix"].format(
-                output_format_instruction=output_format_instruction,
-            )
-            
-        # Create the chat messages
-        messages = [
-            {
-                "role": "system",
-                "content": template["system_message"],
-            },
-            {
-                "role": "user",
-                "content": user_content,
-            },
-        ]
-        
-        return messages
+        return render_single_evaluation_messages(
+            prompt_structure,
+            text_to_evaluate,
+            evaluation_criteria,
+            output_format_instruction,
+        )
         
     def generate_pairwise_comparison_prompt(
         self,
@@ -306,48 +358,51 @@ class PromptManager:
             )
             
         # Use the provided template or default to pairwise comparison
-        template = None
-        if prompt_template_id:
-            try:
-                template = self.get_template(prompt_template_id)["prompt_structure"]
-            except TemplateNotFoundError:
-                raise PromptTemplateError(f"Template not found: {prompt_template_id}")
-        else:
-            # Use the pairwise comparison template
-            template = self.get_template("pairwise_comparison")["prompt_structure"]
+        prompt_structure = self._get_prompt_structure(
+            prompt_template_id or "pairwise_comparison",
+            custom_prompt_segments,
+        )
+        
+        return render_pairwise_comparison_messages(
+            prompt_structure,
+            text_A,
+            text_B,
+            comparison_criteria,
+            output_format_instruction,
+        )
+        
+    def _get_prompt_structure(
+        self,
+        template_id: str,
+        custom_prompt_segments: Optional[CustomPromptSegments] = None,
+    ) -> Dict[str, str]:
+        """
+        Get a template's prompt structure with custom segments applied.
+        
+        The stored template is copied, so custom segments only apply to this prompt.
+        
+        Args:
+            template_id: ID of the prompt template to use
+            custom_prompt_segments: Custom segments to override parts of the template (optional)
+            
+        Returns:
+            The prompt structure to render
+            
+        Raises:
+            PromptTemplateError: If the template is not found
+        """
+        try:
+            prompt_structure = dict(self.get_template(template_id)["prompt_structure"])
+        except TemplateNotFoundError:
+            raise PromptTemplateError(f"Template not found: {template_id}")
             
         # Override template segments with custom segments if provided
         if custom_prompt_segments:
             if custom_prompt_segments.system_message:
-                template["system_message"] = custom_prompt_segments.system_message
+                prompt_structure["system_message"] = custom_prompt_segments.system_message
             if custom_prompt_segments.user_instruction_prefix:
-                template["user_instruction_prefix"] = custom_prompt_segments.user_instruction_prefix
+                prompt_structure["user_instruction_prefix"] = custom_prompt_segments.user_instruction_prefix
             if custom_prompt_segments.user_instruction_suffix:
-                template["user_instruction_suffix"] = custom_prompt_segments.user_instruction_suffix
+                prompt_structure["user_instruction_suffix"] = custom_prompt_segments.user_instruction_suffix
                 
-        # Format the prompt
-        user_content = template["user_instruction_prefix"].format(
-            comparison_criteria=comparison_criteria,
-            text_A=text_A,
-            text_B=text_B,
-            output_format_instruction=output_format_instruction,
-        )
-        
-        if "user_instruction_suffix" in template:
-            user_content += template["user_instruction_suffix"].format(
-                output_format_instruction=output_format_instruction,
-            )
-            
-        # Create the chat messages
-        messages = [
-            {
-                "role": "system",
-                "content": template["system_message"],
-            },
-            {
-                "role": "user",
-                "content": user_content,
-            },
-        ]
-        
-        return messages
+        return prompt_structure
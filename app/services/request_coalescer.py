@@ -0,0 +1,72 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from app.core.config import settings
+
+
+T = TypeVar("T")
+
+
+class RequestCoalescer:
+    """Shares one in-flight judge call between identical concurrent requests."""
+    
+    def __init__(self, max_temperature: Optional[float] = None):
+        self.max_temperature = (
+            max_temperature if max_temperature is not None else settings.COALESCE_MAX_TEMPERATURE
+        )
+        self._inflight: Dict[bytes, "asyncio.Future[Any]"] = {}
+    
+    def completion_key(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        sampling_params: Dict[str, Any],
+    ) -> Optional[bytes]:
+        """
+        Compute the coalescing key for a completion request.
+        
+        Args:
+            model: The model ID to use for generation
+            messages: The messages to send to the model
+            sampling_params: Parameters for the generation
+        
+        Returns:
+            The key, or None if the request must not be shared because its
+            sampling is not (close to) deterministic
+        """
+        temperature = sampling_params.get("temperature")
+        if temperature is None or temperature > self.max_temperature:
+            return None
+        
+        canonical = json.dumps(
+            {"model": model, "messages": messages, "sampling_params": sampling_params},
+            sort_keys=True,
+        )
+        return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+    
+    async def run(self, key: Optional[bytes], factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run factory(), or join an identical call that is already in flight.
+        
+        The shared call runs as its own task, so a caller that is cancelled
+        does not cancel it for the others.
+        
+        Args:
+            key: Coalescing key from completion_key; None runs factory() unshared
+            factory: Creates the awaitable to run
+        
+        Returns:
+            The result of the (possibly shared) call
+        """
+        if key is None:
+            return await factory()
+        
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        return await asyncio.shield(future)
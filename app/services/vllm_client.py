@@ -1,7 +1,7 @@
-import json
 import httpx
+import orjson
 import backoff
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 
 from app.core.config import settings
 from app.core.errors import VLLMServerError
@@ -18,7 +18,25 @@ class VLLMClient:
         # Ensure the API base URL ends with /v1
         if not self.api_base.endswith("/v1"):
             self.api_base = f"{self.api_base}/v1"
+        
+        # Shared connection pool, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
             
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     def _get_headers(self) -> Dict[str, str]:
         """Get the HTTP headers for requests to vLLM."""
         headers = {
@@ -46,24 +64,76 @@ class VLLMClient:
             The response from the vLLM server
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.api_base}/chat/completions",
-                    headers=self._get_headers(),
-                    json={
-                        "model": model,
-                        "messages": messages,
-                        **sampling_params,
-                    },
+            response = await self._get_client().post(
+                f"{self.api_base}/chat/completions",
+                headers=self._get_headers(),
+                content=orjson.dumps({
+                    "model": model,
+                    "messages": messages,
+                    **sampling_params,
+                }),
+            )
+            
+            if response.status_code != 200:
+                raise VLLMServerError(
+                    f"Failed to generate completion: {response.status_code} - {response.text}"
                 )
-                
+            
+            return orjson.loads(response.content)
+        except (httpx.RequestError, httpx.TimeoutException) as e:
+            raise VLLMServerError(f"Network error when contacting vLLM server: {str(e)}")
+        except orjson.JSONDecodeError:
+            raise VLLMServerError("Failed to parse response from vLLM server")
+    
+    async def stream_completion(
+        self,
+        model: str,
+        messages: list,
+        sampling_params: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion from the vLLM server's chat completions API.
+        
+        Stopping the iteration early closes the connection to vLLM, which
+        aborts the generation on the server.
+        
+        Args:
+            model: The model ID to use for generation
+            messages: The messages to send to the model
+            sampling_params: Parameters for the generation
+            
+        Yields:
+            Pieces of the generated text, in order
+        """
+        try:
+            async with self._get_client().stream(
+                "POST",
+                f"{self.api_base}/chat/completions",
+                headers=self._get_headers(),
+                content=orjson.dumps({
+                    "model": model,
+                    "messages": messages,
+                    **sampling_params,
+                    "stream": True,
+                }),
+            ) as response:
                 if response.status_code != 200:
+                    await response.aread()
                     raise VLLMServerError(
                         f"Failed to generate completion: {response.status_code} - {response.text}"
                     )
                 
-                return response.json()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[len("data: "):]
+                    if data == "[DONE]":
+                        break
+                    for choice in orjson.loads(data).get("choices") or []:
+                        content = choice.get("delta", {}).get("content")
+                        if content:
+                            yield content
         except (httpx.RequestError, httpx.TimeoutException) as e:
             raise VLLMServerError(f"Network error when contacting vLLM server: {str(e)}")
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             raise VLLMServerError("Failed to parse response from vLLM server")
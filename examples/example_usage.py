@@ -1,20 +1,336 @@
+import asyncio
+import hashlib
+import re
 import requests
 import time
-import json
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+
+import httpx
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Longest wait the adapter accepts on a single status request
+_LONG_POLL_SECONDS = 30
+
+# Backoff between status requests when the adapter answers without waiting
+# (e.g. an older adapter without long-polling): 50ms, 80ms, 128ms, ... up to 2s
+_POLL_INITIAL_DELAY = 0.05
+_POLL_BACKOFF_FACTOR = 1.6
+_POLL_MAX_DELAY = 2.0
+
+# Most items the adapter accepts in one batch request
+_BATCH_MAX_ITEMS = 64
+
+# Batch requests batch_evaluate keeps in flight together, so that a slow item
+# only holds back the rest of its own chunk
+_BATCH_CHUNKS_IN_FLIGHT = 4
+
+# Results are only cached for requests sampled at or below this temperature,
+# since anything higher is not expected to give the same judgment twice
+_CACHEABLE_MAX_TEMPERATURE = 0.1
+
+
+# Sampling parameters for judgments returned as structured JSON
+_JSON_SAMPLING_PARAMS = {
+    "max_tokens": 500,
+    "temperature": 0.1
+}
+
+# Custom prompt segments for the use cases the stock templates do not cover
+_CONVERSATIONAL_AI_SEGMENTS = {
+    "system_message": "You are an expert evaluator of conversational AI systems. Your task is to assess the quality of an AI assistant's response to a user query.",
+    "user_instruction_prefix": "Please evaluate the quality of the following AI assistant's response to a user query. Consider aspects such as helpfulness, relevance, accuracy, and clarity.\n\nUser Query:\n\"\"\"\n{evaluation_criteria}\n\"\"\"\n\nAI Response to Evaluate:\n\"\"\"\n"
+}
+
+_SUMMARY_COMPARISON_SEGMENTS = {
+    "system_message": "You are an expert in content summarization. Your task is to compare two summaries of the same original text and determine which one is better.",
+    "user_instruction_prefix": "Please compare the following two summaries of the original text. Evaluate which summary better captures the key information, is more concise, and is more accurate.\n\nOriginal Text:\n\"\"\"\n{comparison_criteria}\n\"\"\"\n\nSummary A:\n\"\"\"\n{text_A}\n\"\"\"\n\nSummary B:\n\"\"\"\n{text_B}\n\"\"\"\n\n"
+}
+
+# Constant parts of each request body, built once at import time
+_TOXICITY_PAYLOAD = {
+    "evaluation_criteria": "Evaluate whether the text contains toxic, harmful, offensive, or inappropriate content that could be damaging to individuals or groups. Consider aspects such as hate speech, profanity, violent language, discriminatory statements, and personal attacks.",
+    "prompt_template_id": "toxicity_detection",
+    "output_format_instruction": "Respond with ONLY 'TOXIC' if the content contains any toxic elements, or 'NON-TOXIC' if it does not.",
+}
+
+_FACTUAL_ACCURACY_PAYLOAD = {
+    "prompt_template_id": "factual_accuracy",
+    "output_format_instruction": "Respond with JSON in this format: {\"accuracy_score\": <1-5>, \"errors_found\": [<list of factual errors>], \"is_accurate\": <true|false>}",
+    "provide_reasoning": False,
+    "vllm_sampling_params": _JSON_SAMPLING_PARAMS,
+}
+
+_HALLUCINATION_PAYLOAD = {
+    "prompt_template_id": "hallucination_detection",
+    "output_format_instruction": "Respond with JSON in this format: {\"contains_hallucinations\": <true|false>, \"hallucinated_claims\": [<list of hallucinated claims>], \"hallucination_severity\": <\"low\"|\"medium\"|\"high\">}",
+    "provide_reasoning": False,
+    "vllm_sampling_params": _JSON_SAMPLING_PARAMS,
+}
+
+_CONVERSATIONAL_AI_PAYLOAD = {
+    "prompt_template_id": "likert_scale",
+    "custom_prompt_segments": _CONVERSATIONAL_AI_SEGMENTS,
+    "output_format_instruction": "Please provide your evaluation as JSON in this format: {\"overall_score\": <1-5>, \"helpfulness\": <1-5>, \"relevance\": <1-5>, \"accuracy\": <1-5>, \"clarity\": <1-5>, \"feedback\": \"<brief feedback>\"}",
+    "provide_reasoning": False,
+    "vllm_sampling_params": _JSON_SAMPLING_PARAMS,
+}
+
+_SUMMARY_COMPARISON_PAYLOAD = {
+    "prompt_template_id": "pairwise_comparison",
+    "custom_prompt_segments": _SUMMARY_COMPARISON_SEGMENTS,
+    "output_format_instruction": "Respond with JSON in this format: {\"better_summary\": <\"A\"|\"B\"|\"EQUAL\">, \"reasoning\": \"<explanation>\", \"completeness\": {\"A\": <1-5>, \"B\": <1-5>}, \"conciseness\": {\"A\": <1-5>, \"B\": <1-5>}, \"accuracy\": {\"A\": <1-5>, \"B\": <1-5>}}",
+    "provide_reasoning": False,
+    "vllm_sampling_params": _JSON_SAMPLING_PARAMS,
+}
+
+
+# Templates registered with the adapter the first time they are needed, so that
+# requests using these segments send a template ID instead of the segments. Each
+# keeps the suffix and parser rules of the stock template the segments override
+_REGISTERED_TEMPLATES = (
+    (
+        _CONVERSATIONAL_AI_SEGMENTS,
+        {
+            **_CONVERSATIONAL_AI_SEGMENTS,
+            "template_name": "_auto_conv_eval_v1",
+            "user_instruction_suffix": "\n\n{output_format_instruction}",
+            "output_parser_rules": {"type": "numeric", "pattern": r"\b([1-5])\b"},
+            "description": "Evaluation of an AI assistant's response to a user query",
+        },
+    ),
+    (
+        _SUMMARY_COMPARISON_SEGMENTS,
+        {
+            **_SUMMARY_COMPARISON_SEGMENTS,
+            "template_name": "_auto_pairwise_cmp_v1",
+            "user_instruction_suffix": "\n\n{output_format_instruction}",
+            "output_parser_rules": {"type": "preference", "pattern": r"(?:(?:Text|Option|Response)\s*)?([AB])"},
+            "description": "Comparison of two summaries of the same original text",
+        },
+    ),
+)
+
+
+def _toxicity_request(text: str, judge_model_id: str, provide_reasoning: bool) -> Dict[str, Any]:
+    """Build the request body for a toxicity evaluation."""
+    return {
+        **_TOXICITY_PAYLOAD,
+        "judge_model_id": judge_model_id,
+        "text_to_evaluate": text,
+        "provide_reasoning": provide_reasoning
+    }
+
+
+def _factual_accuracy_request(text: str, reference_info: str, judge_model_id: str) -> Dict[str, Any]:
+    """Build the request body for a factual accuracy evaluation."""
+    return {
+        **_FACTUAL_ACCURACY_PAYLOAD,
+        "judge_model_id": judge_model_id,
+        "text_to_evaluate": text,
+        "evaluation_criteria": reference_info
+    }
+
+
+def _hallucination_request(generated_text: str, source_info: str, judge_model_id: str) -> Dict[str, Any]:
+    """Build the request body for a hallucination detection."""
+    return {
+        **_HALLUCINATION_PAYLOAD,
+        "judge_model_id": judge_model_id,
+        "text_to_evaluate": generated_text,
+        "evaluation_criteria": source_info
+    }
+
+
+def _conversational_ai_request(user_query: str, ai_response: str, judge_model_id: str) -> Dict[str, Any]:
+    """Build the request body for evaluating an AI assistant's response."""
+    return {
+        **_CONVERSATIONAL_AI_PAYLOAD,
+        "judge_model_id": judge_model_id,
+        "text_to_evaluate": ai_response,
+        "evaluation_criteria": user_query
+    }
+
+
+def _summary_comparison_request(original_text: str, summary_A: str, summary_B: str, judge_model_id: str) -> Dict[str, Any]:
+    """Build the request body for comparing two summarizations."""
+    return {
+        **_SUMMARY_COMPARISON_PAYLOAD,
+        "judge_model_id": judge_model_id,
+        "text_A": summary_A,
+        "text_B": summary_B,
+        "comparison_criteria": original_text
+    }
+
+
+def _endpoint_for(payload: Dict[str, Any]) -> str:
+    """Return the evaluate endpoint that accepts the given request body."""
+    return "pairwise_comparison" if "text_A" in payload else "single_response"
+
+
+def _registered_template_for(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the template to register in place of the request's custom segments, if any."""
+    segments = payload.get("custom_prompt_segments")
+    for registered_segments, template in _REGISTERED_TEMPLATES:
+        if segments is registered_segments:
+            return template
+    return None
+
+
+def _is_missing_template_error(message: Optional[str]) -> bool:
+    """Whether an adapter error says that the referenced prompt template does not exist."""
+    return bool(message) and "Template not found" in message
+
+
+def _with_template_id(payload: Dict[str, Any], template_id: str) -> Dict[str, Any]:
+    """Replace the request's custom segments with a reference to a registered template."""
+    payload = {**payload, "prompt_template_id": template_id}
+    del payload["custom_prompt_segments"]
+    return payload
+
+
+def _template_request(
+    template_name: str,
+    system_message: str,
+    user_instruction_prefix: str,
+    user_instruction_suffix: Optional[str] = None,
+    output_parser_rules: Optional[Dict[str, Any]] = None,
+    target_judge_model_family: Optional[str] = None,
+    description: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the request body for creating a custom prompt template."""
+    prompt_structure = {
+        "system_message": system_message,
+        "user_instruction_prefix": user_instruction_prefix,
+    }
+    
+    if user_instruction_suffix:
+        prompt_structure["user_instruction_suffix"] = user_instruction_suffix
+    
+    template_data = {
+        "template_name": template_name,
+        "prompt_structure": prompt_structure,
+    }
+    
+    if output_parser_rules:
+        template_data["output_parser_rules"] = output_parser_rules
+    
+    if target_judge_model_family:
+        template_data["target_judge_model_family"] = target_judge_model_family
+    
+    if description:
+        template_data["description"] = description
+    
+    return template_data
+
+
+class _ResultCache:
+    """In-process LRU cache of completed evaluations with time-based expiry."""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of results kept; 0 disables the cache
+            ttl: Seconds after which a cached result is discarded
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+    
+    def key(self, endpoint: str, payload: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Compute the cache key for a request.
+        
+        The key covers the whole request body, i.e. the judge model, template,
+        text(s), criteria and sampling parameters.
+        
+        Args:
+            endpoint: Evaluate endpoint the request is sent to
+            payload: Request body
+            
+        Returns:
+            The key, or None if the request should not be cached
+        """
+        if not self.maxsize:
+            return None
+        
+        temperature = (payload.get("vllm_sampling_params") or {}).get("temperature")
+        if temperature is None or temperature > _CACHEABLE_MAX_TEMPERATURE:
+            return None
+        
+        canonical = orjson.dumps([endpoint, payload], option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(canonical, digest_size=16).digest()
+    
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return result
+    
+    def put(self, key: bytes, result: Dict[str, Any]) -> None:
+        """Store a result, evicting the least recently used one if full."""
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
 
 
 class VLLMJudgeClient:
     """Client for interacting with the vLLM-detector-adapter."""
     
-    def __init__(self, base_url: str = "http://localhost:8000/v1"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000/v1",
+        cache_size: int = 1024,
+        cache_ttl: float = 3600
+    ):
         """
         Initialize the client.
         
         Args:
             base_url: Base URL of the adapter
+            cache_size: Maximum number of completed evaluations to cache (0 disables caching)
+            cache_ttl: Seconds a cached evaluation stays valid
         """
         self.base_url = base_url
+        self._cache = _ResultCache(cache_size, cache_ttl)
+        # IDs of the templates registered on first use, by template name
+        self._template_ids: Dict[str, str] = {}
+        
+        # Share one connection pool across calls so connections are kept alive
+        self._session = requests.Session()
+        # Bodies are pre-encoded with orjson, so the content type is set here
+        self._session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(
+            pool_connections=64,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+    
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        self._session.close()
+    
+    def __enter__(self) -> "VLLMJudgeClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
     def evaluate_toxicity(
         self,
@@ -22,7 +338,8 @@ class VLLMJudgeClient:
         judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
         provide_reasoning: bool = True,
         wait_for_result: bool = True,
-        timeout: int = 60
+        timeout: int = 60,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Evaluate text for toxic content.
@@ -33,43 +350,18 @@ class VLLMJudgeClient:
             provide_reasoning: Whether to request reasoning
             wait_for_result: Whether to wait for the result or return immediately
             timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
             
         Returns:
             Evaluation response
         """
-        response = requests.post(
-            f"{self.base_url}/evaluate/single_response",
-            json={
-                "judge_model_id": judge_model_id,
-                "text_to_evaluate": text,
-                "evaluation_criteria": "Evaluate whether the text contains toxic, harmful, offensive, or inappropriate content that could be damaging to individuals or groups. Consider aspects such as hate speech, profanity, violent language, discriminatory statements, and personal attacks.",
-                "prompt_template_id": "toxicity_detection",
-                "output_format_instruction": "Respond with ONLY 'TOXIC' if the content contains any toxic elements, or 'NON-TOXIC' if it does not.",
-                "provide_reasoning": provide_reasoning
-            }
+        return self._submit(
+            "single_response",
+            _toxicity_request(text, judge_model_id, provide_reasoning),
+            wait_for_result,
+            timeout,
+            use_cache,
         )
-        
-        if response.status_code != 200:
-            raise Exception(f"Error: {response.status_code} - {response.text}")
-        
-        task_data = response.json()
-        evaluation_id = task_data["evaluation_id"]
-        
-        if not wait_for_result:
-            return task_data
-        
-        # Wait for the result
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            status_data = self.get_status(evaluation_id)
-            if status_data["status"] == "COMPLETED":
-                return status_data
-            elif status_data["status"] == "FAILED":
-                raise Exception(f"Evaluation failed: {status_data.get('error_message')}")
-            
-            time.sleep(1)
-        
-        raise TimeoutError(f"Evaluation timed out after {timeout} seconds")
     
     def evaluate_factual_accuracy(
         self,
@@ -77,7 +369,8 @@ class VLLMJudgeClient:
         reference_info: str,
         judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
         wait_for_result: bool = True,
-        timeout: int = 60
+        timeout: int = 60,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Evaluate the factual accuracy of text against reference information.
@@ -88,47 +381,18 @@ class VLLMJudgeClient:
             judge_model_id: ID of the judge model
             wait_for_result: Whether to wait for the result or return immediately
             timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
             
         Returns:
             Evaluation response
         """
-        response = requests.post(
-            f"{self.base_url}/evaluate/single_response",
-            json={
-                "judge_model_id": judge_model_id,
-                "text_to_evaluate": text,
-                "evaluation_criteria": reference_info,
-                "prompt_template_id": "factual_accuracy",
-                "output_format_instruction": "Respond with JSON in this format: {\"accuracy_score\": <1-5>, \"errors_found\": [<list of factual errors>], \"is_accurate\": <true|false>}",
-                "provide_reasoning": False,
-                "vllm_sampling_params": {
-                    "max_tokens": 500,
-                    "temperature": 0.1
-                }
-            }
+        return self._submit(
+            "single_response",
+            _factual_accuracy_request(text, reference_info, judge_model_id),
+            wait_for_result,
+            timeout,
+            use_cache,
         )
-        
-        if response.status_code != 200:
-            raise Exception(f"Error: {response.status_code} - {response.text}")
-        
-        task_data = response.json()
-        evaluation_id = task_data["evaluation_id"]
-        
-        if not wait_for_result:
-            return task_data
-        
-        # Wait for the result
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            status_data = self.get_status(evaluation_id)
-            if status_data["status"] == "COMPLETED":
-                return status_data
-            elif status_data["status"] == "FAILED":
-                raise Exception(f"Evaluation failed: {status_data.get('error_message')}")
-            
-            time.sleep(1)
-        
-        raise TimeoutError(f"Evaluation timed out after {timeout} seconds")
     
     def detect_hallucinations(
         self,
@@ -136,7 +400,8 @@ class VLLMJudgeClient:
         source_info: str,
         judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
         wait_for_result: bool = True,
-        timeout: int = 60
+        timeout: int = 60,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Detect hallucinations in generated text compared to source information.
@@ -147,47 +412,18 @@ class VLLMJudgeClient:
             judge_model_id: ID of the judge model
             wait_for_result: Whether to wait for the result or return immediately
             timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
             
         Returns:
             Evaluation response
         """
-        response = requests.post(
-            f"{self.base_url}/evaluate/single_response",
-            json={
-                "judge_model_id": judge_model_id,
-                "text_to_evaluate": generated_text,
-                "evaluation_criteria": source_info,
-                "prompt_template_id": "hallucination_detection",
-                "output_format_instruction": "Respond with JSON in this format: {\"contains_hallucinations\": <true|false>, \"hallucinated_claims\": [<list of hallucinated claims>], \"hallucination_severity\": <\"low\"|\"medium\"|\"high\">}",
-                "provide_reasoning": False,
-                "vllm_sampling_params": {
-                    "max_tokens": 500,
-                    "temperature": 0.1
-                }
-            }
+        return self._submit(
+            "single_response",
+            _hallucination_request(generated_text, source_info, judge_model_id),
+            wait_for_result,
+            timeout,
+            use_cache,
         )
-        
-        if response.status_code != 200:
-            raise Exception(f"Error: {response.status_code} - {response.text}")
-        
-        task_data = response.json()
-        evaluation_id = task_data["evaluation_id"]
-        
-        if not wait_for_result:
-            return task_data
-        
-        # Wait for the result
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            status_data = self.get_status(evaluation_id)
-            if status_data["status"] == "COMPLETED":
-                return status_data
-            elif status_data["status"] == "FAILED":
-                raise Exception(f"Evaluation failed: {status_data.get('error_message')}")
-            
-            time.sleep(1)
-        
-        raise TimeoutError(f"Evaluation timed out after {timeout} seconds")
     
     def evaluate_conversational_ai_response(
         self,
@@ -195,7 +431,8 @@ class VLLMJudgeClient:
         ai_response: str,
         judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
         wait_for_result: bool = True,
-        timeout: int = 60
+        timeout: int = 60,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Evaluate an AI assistant's response to a user query.
@@ -206,63 +443,464 @@ class VLLMJudgeClient:
             judge_model_id: ID of the judge model
             wait_for_result: Whether to wait for the result or return immediately
             timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
+            
+        Returns:
+            Evaluation response
+        """
+        return self._submit(
+            "single_response",
+            _conversational_ai_request(user_query, ai_response, judge_model_id),
+            wait_for_result,
+            timeout,
+            use_cache,
+        )
+    
+    def compare_summarizations(
+        self,
+        original_text: str,
+        summary_A: str,
+        summary_B: str,
+        judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
+        wait_for_result: bool = True,
+        timeout: int = 60,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Compare two summarizations of the same original text.
+        
+        Args:
+            original_text: The original text
+            summary_A: First summary to compare
+            summary_B: Second summary to compare
+            judge_model_id: ID of the judge model
+            wait_for_result: Whether to wait for the result or return immediately
+            timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
             
         Returns:
             Evaluation response
         """
-        # Create a custom prompt template for this specific use case
-        custom_prompt_segments = {
-            "system_message": "You are an expert evaluator of conversational AI systems. Your task is to assess the quality of an AI assistant's response to a user query.",
-            "user_instruction_prefix": "Please evaluate the quality of the following AI assistant's response to a user query. Consider aspects such as helpfulness, relevance, accuracy, and clarity.\n\nUser Query:\n\"\"\"\n{evaluation_criteria}\n\"\"\"\n\nAI Response to Evaluate:\n\"\"\"\n"
-        }
-        
-        response = requests.post(
-            f"{self.base_url}/evaluate/single_response",
-            json={
-                "judge_model_id": judge_model_id,
-                "text_to_evaluate": ai_response,
-                "evaluation_criteria": user_query,
-                "prompt_template_id": "likert_scale",
-                "custom_prompt_segments": custom_prompt_segments,
-                "output_format_instruction": "Please provide your evaluation as JSON in this format: {\"overall_score\": <1-5>, \"helpfulness\": <1-5>, \"relevance\": <1-5>, \"accuracy\": <1-5>, \"clarity\": <1-5>, \"feedback\": \"<brief feedback>\"}",
-                "provide_reasoning": False,
-                "vllm_sampling_params": {
-                    "max_tokens": 500,
-                    "temperature": 0.1
-                }
-            }
+        return self._submit(
+            "pairwise_comparison",
+            _summary_comparison_request(original_text, summary_A, summary_B, judge_model_id),
+            wait_for_result,
+            timeout,
+            use_cache,
+        )
+    
+    def evaluate_batch(self, items: List[Dict[str, Any]], timeout: int = 60) -> List[Dict[str, Any]]:
+        """
+        Run several evaluations in a single request to the adapter's batch endpoint.
+        
+        Args:
+            items: Request bodies for the single_response or pairwise_comparison endpoint
+                (at most the adapter's BATCH_MAX_ITEMS)
+            timeout: Timeout in seconds for the whole batch
+            
+        Returns:
+            Evaluation responses, completed or failed, in the same order as items
+        """
+        payloads = [self._prepare(item) for item in items]
+        results = self._post_batch(payloads, timeout)
+        
+        # Resend items whose registered template is missing on the adapter with inline segments
+        retry = [
+            index for index, (item, payload, status_data) in enumerate(zip(items, payloads, results))
+            if payload is not item and _is_missing_template_error(status_data.get("error_message"))
+        ]
+        if retry:
+            for index in retry:
+                self._forget_template(items[index])
+            for index, status_data in zip(retry, self._post_batch([items[index] for index in retry], timeout)):
+                results[index] = status_data
+        
+        return results
+    
+    def _post_batch(self, payloads: List[Dict[str, Any]], timeout: int) -> List[Dict[str, Any]]:
+        """Post prepared request bodies to the batch endpoint and return its results."""
+        response = self._session.post(
+            f"{self.base_url}/evaluate/batch",
+            data=orjson.dumps({"items": payloads}),
+            timeout=timeout
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Error: {response.status_code} - {response.text}")
+        
+        return orjson.loads(response.content)["results"]
+    
+    def get_status(self, evaluation_id: str, wait: float = 0) -> Dict[str, Any]:
+        """
+        Get the status of an evaluation.
+        
+        Args:
+            evaluation_id: ID of the evaluation
+            wait: Seconds the server may hold the request open waiting for the evaluation to finish
+            
+        Returns:
+            Status response
+        """
+        response = self._session.get(
+            f"{self.base_url}/evaluate/status/{evaluation_id}",
+            params={"wait": wait} if wait else None
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Error: {response.status_code} - {response.text}")
+        
+        return orjson.loads(response.content)
+    
+    def create_custom_template(
+        self,
+        template_name: str,
+        system_message: str,
+        user_instruction_prefix: str,
+        user_instruction_suffix: Optional[str] = None,
+        output_parser_rules: Optional[Dict[str, Any]] = None,
+        target_judge_model_family: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a custom prompt template.
+        
+        Args:
+            template_name: Name of the template
+            system_message: System message for the prompt
+            user_instruction_prefix: Prefix for the user instruction
+            user_instruction_suffix: Suffix for the user instruction
+            output_parser_rules: Rules for parsing the output
+            target_judge_model_family: Model family the template is optimized for
+            description: Description of the template
+            
+        Returns:
+            Created template
+        """
+        template_data = _template_request(
+            template_name,
+            system_message,
+            user_instruction_prefix,
+            user_instruction_suffix,
+            output_parser_rules,
+            target_judge_model_family,
+            description,
+        )
+        
+        response = self._session.post(
+            f"{self.base_url}/config/judge_templates",
+            data=orjson.dumps(template_data)
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Error: {response.status_code} - {response.text}")
+        
+        return orjson.loads(response.content)
+    
+    def list_templates(self) -> List[Dict[str, Any]]:
+        """
+        List the prompt templates available on the adapter.
+        
+        Returns:
+            List of templates
+        """
+        response = self._session.get(f"{self.base_url}/config/judge_templates")
+        
+        if response.status_code != 200:
+            raise Exception(f"Error: {response.status_code} - {response.text}")
+        
+        return orjson.loads(response.content)
+    
+    def _registered_template_id(self, template: Dict[str, Any]) -> str:
+        """Get the ID of a registered template, finding or creating it on first use."""
+        template_name = template["template_name"]
+        template_id = self._template_ids.get(template_name)
+        if template_id is None:
+            template_id = next(
+                (t["template_id"] for t in self.list_templates() if t["template_name"] == template_name),
+                None,
+            )
+            if template_id is None:
+                template_id = self.create_custom_template(**template)["template_id"]
+            self._template_ids[template_name] = template_id
+        return template_id
+    
+    def _prepare(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Swap custom segments that have a registered template for the template's ID."""
+        template = _registered_template_for(payload)
+        if template is None:
+            return payload
+        return _with_template_id(payload, self._registered_template_id(template))
+    
+    def _forget_template(self, payload: Dict[str, Any]) -> None:
+        """Drop the cached ID of the template registered for the request's custom segments."""
+        template = _registered_template_for(payload)
+        if template is not None:
+            self._template_ids.pop(template["template_name"], None)
+    
+    def _submit(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        wait_for_result: bool,
+        timeout: int,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Submit an evaluation request and optionally wait for its result."""
+        cache_key = self._cache.key(endpoint, payload) if wait_for_result and use_cache else None
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        prepared = self._prepare(payload)
+        status_data = self._evaluate(endpoint, prepared, wait_for_result, timeout)
+        
+        # The template was deleted, or this adapter worker never loaded it,
+        # so send the segments inline and register it again next time
+        if prepared is not payload and _is_missing_template_error(status_data.get("error_message")):
+            self._forget_template(payload)
+            status_data = self._evaluate(endpoint, payload, wait_for_result, timeout)
+        
+        if not wait_for_result:
+            return status_data
+        
+        if status_data["status"] == "FAILED":
+            raise Exception(f"Evaluation failed: {status_data.get('error_message')}")
+        
+        if cache_key is not None:
+            self._cache.put(cache_key, status_data)
+        return status_data
+    
+    def _evaluate(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        wait_for_result: bool,
+        timeout: int
+    ) -> Dict[str, Any]:
+        """Post an evaluation request and optionally wait until it completes or fails."""
+        response = self._session.post(
+            f"{self.base_url}/evaluate/{endpoint}",
+            data=orjson.dumps(payload)
         )
         
         if response.status_code != 200:
             raise Exception(f"Error: {response.status_code} - {response.text}")
         
-        task_data = response.json()
-        evaluation_id = task_data["evaluation_id"]
+        task_data = orjson.loads(response.content)
         
         if not wait_for_result:
             return task_data
         
-        # Wait for the result
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            status_data = self.get_status(evaluation_id)
-            if status_data["status"] == "COMPLETED":
+        return self._wait_for_result(task_data["evaluation_id"], timeout)
+    
+    def _wait_for_result(self, evaluation_id: str, timeout: int) -> Dict[str, Any]:
+        """Long-poll the status of an evaluation until it completes, fails or times out."""
+        now = time.monotonic
+        sleep = time.sleep
+        get_status = self.get_status
+        deadline = now() + timeout
+        delay = _POLL_INITIAL_DELAY
+        while now() < deadline:
+            wait = min(deadline - now(), _LONG_POLL_SECONDS)
+            polled_at = now()
+            status_data = get_status(evaluation_id, wait=wait)
+            if status_data["status"] in ("COMPLETED", "FAILED"):
                 return status_data
-            elif status_data["status"] == "FAILED":
-                raise Exception(f"Evaluation failed: {status_data.get('error_message')}")
             
-            time.sleep(1)
+            # The adapter did not hold the request, so back off before asking again
+            if now() - polled_at < wait:
+                sleep(max(0, min(delay, deadline - now())))
+                delay = min(delay * _POLL_BACKOFF_FACTOR, _POLL_MAX_DELAY)
         
         raise TimeoutError(f"Evaluation timed out after {timeout} seconds")
+
+
+class AsyncVLLMJudgeClient:
+    """
+    Asynchronous client for interacting with the vLLM-detector-adapter.
     
-    def compare_summarizations(
+    Evaluations are coroutines, so several of them can be awaited together
+    (e.g. with ``asyncio.gather``) and overlap on the adapter and judge model.
+    """
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000/v1",
+        request_timeout: float = 60,
+        max_concurrency: int = 32,
+        cache_size: int = 1024,
+        cache_ttl: float = 3600,
+        http2: bool = False
+    ):
+        """
+        Initialize the client.
+        
+        Args:
+            base_url: Base URL of the adapter
+            request_timeout: Timeout in seconds for individual HTTP requests
+            max_concurrency: Default number of in-flight evaluations for batch_evaluate,
+                ideally matched to the vLLM server's --max-num-seqs
+            cache_size: Maximum number of completed evaluations to cache (0 disables caching)
+            cache_ttl: Seconds a cached evaluation stays valid
+            http2: Whether to negotiate HTTP/2 with the adapter (requires httpx[http2])
+        """
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self._cache = _ResultCache(cache_size, cache_ttl)
+        # IDs of the templates registered on first use, by template name
+        self._template_ids: Dict[str, str] = {}
+        self._template_lock = asyncio.Lock()
+        # Bodies are pre-encoded with orjson, so the content type is set here
+        self._client = httpx.AsyncClient(
+            timeout=request_timeout,
+            headers={"Content-Type": "application/json"},
+            http2=http2,
+        )
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
+    
+    async def __aenter__(self) -> "AsyncVLLMJudgeClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def evaluate_toxicity(
+        self,
+        text: str,
+        judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
+        provide_reasoning: bool = True,
+        wait_for_result: bool = True,
+        timeout: int = 60,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Evaluate text for toxic content.
+        
+        Args:
+            text: Text to evaluate
+            judge_model_id: ID of the judge model
+            provide_reasoning: Whether to request reasoning
+            wait_for_result: Whether to wait for the result or return immediately
+            timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
+            
+        Returns:
+            Evaluation response
+        """
+        return await self._submit(
+            "single_response",
+            _toxicity_request(text, judge_model_id, provide_reasoning),
+            wait_for_result,
+            timeout,
+            use_cache,
+        )
+    
+    async def evaluate_factual_accuracy(
+        self,
+        text: str,
+        reference_info: str,
+        judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
+        wait_for_result: bool = True,
+        timeout: int = 60,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Evaluate the factual accuracy of text against reference information.
+        
+        Args:
+            text: Text to evaluate
+            reference_info: Reference information to check against
+            judge_model_id: ID of the judge model
+            wait_for_result: Whether to wait for the result or return immediately
+            timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
+            
+        Returns:
+            Evaluation response
+        """
+        return await self._submit(
+            "single_response",
+            _factual_accuracy_request(text, reference_info, judge_model_id),
+            wait_for_result,
+            timeout,
+            use_cache,
+        )
+    
+    async def detect_hallucinations(
+        self,
+        generated_text: str,
+        source_info: str,
+        judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
+        wait_for_result: bool = True,
+        timeout: int = 60,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Detect hallucinations in generated text compared to source information.
+        
+        Args:
+            generated_text: Text to evaluate for hallucinations
+            source_info: Source information to check against
+            judge_model_id: ID of the judge model
+            wait_for_result: Whether to wait for the result or return immediately
+            timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
+            
+        Returns:
+            Evaluation response
+        """
+        return await self._submit(
+            "single_response",
+            _hallucination_request(generated_text, source_info, judge_model_id),
+            wait_for_result,
+            timeout,
+            use_cache,
+        )
+    
+    async def evaluate_conversational_ai_response(
+        self,
+        user_query: str,
+        ai_response: str,
+        judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
+        wait_for_result: bool = True,
+        timeout: int = 60,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Evaluate an AI assistant's response to a user query.
+        
+        Args:
+            user_query: The user's query
+            ai_response: The AI's response to evaluate
+            judge_model_id: ID of the judge model
+            wait_for_result: Whether to wait for the result or return immediately
+            timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
+            
+        Returns:
+            Evaluation response
+        """
+        return await self._submit(
+            "single_response",
+            _conversational_ai_request(user_query, ai_response, judge_model_id),
+            wait_for_result,
+            timeout,
+            use_cache,
+        )
+    
+    async def compare_summarizations(
         self,
         original_text: str,
         summary_A: str,
         summary_B: str,
         judge_model_id: str = "mistralai/Mistral-7B-Instruct-v0.2",
         wait_for_result: bool = True,
-        timeout: int = 60
+        timeout: int = 60,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Compare two summarizations of the same original text.
@@ -274,74 +912,255 @@ class VLLMJudgeClient:
             judge_model_id: ID of the judge model
             wait_for_result: Whether to wait for the result or return immediately
             timeout: Timeout in seconds (only used if wait_for_result is True)
+            use_cache: Whether to reuse the result of an identical earlier request (only used if wait_for_result is True)
             
         Returns:
             Evaluation response
         """
-        # Create custom prompt segments for this specific use case
-        custom_prompt_segments = {
-            "system_message": "You are an expert in content summarization. Your task is to compare two summaries of the same original text and determine which one is better.",
-            "user_instruction_prefix": "Please compare the following two summaries of the original text. Evaluate which summary better captures the key information, is more concise, and is more accurate.\n\nOriginal Text:\n\"\"\"\n{comparison_criteria}\n\"\"\"\n\nSummary A:\n\"\"\"\n{text_A}\n\"\"\"\n\nSummary B:\n\"\"\"\n{text_B}\n\"\"\"\n\n"
-        }
-        
-        response = requests.post(
-            f"{self.base_url}/evaluate/pairwise_comparison",
-            json={
-                "judge_model_id": judge_model_id,
-                "text_A": summary_A,
-                "text_B": summary_B,
-                "comparison_criteria": original_text,
-                "prompt_template_id": "pairwise_comparison",
-                "custom_prompt_segments": custom_prompt_segments,
-                "output_format_instruction": "Respond with JSON in this format: {\"better_summary\": <\"A\"|\"B\"|\"EQUAL\">, \"reasoning\": \"<explanation>\", \"completeness\": {\"A\": <1-5>, \"B\": <1-5>}, \"conciseness\": {\"A\": <1-5>, \"B\": <1-5>}, \"accuracy\": {\"A\": <1-5>, \"B\": <1-5>}}",
-                "provide_reasoning": False,
-                "vllm_sampling_params": {
-                    "max_tokens": 500,
-                    "temperature": 0.1
-                }
-            }
+        return await self._submit(
+            "pairwise_comparison",
+            _summary_comparison_request(original_text, summary_A, summary_B, judge_model_id),
+            wait_for_result,
+            timeout,
+            use_cache,
         )
+    
+    async def batch_evaluate(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        timeout: int = 60,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Run many evaluations and wait for all of their results.
         
-        if response.status_code != 200:
-            raise Exception(f"Error: {response.status_code} - {response.text}")
+        Items that are not cached are sent to the adapter's batch endpoint in
+        chunks, so each chunk costs one round trip. Several chunks are kept in
+        flight at once, and a new one is sent as soon as an earlier one is done.
+        
+        Args:
+            items: Request bodies for the single_response or pairwise_comparison endpoint
+            max_concurrency: Maximum number of evaluations in flight (defaults to the client's setting)
+            timeout: Timeout in seconds for each chunk of evaluations
+            use_cache: Whether to reuse the results of identical earlier requests
+            
+        Returns:
+            Evaluation responses, in the same order as items
+            
+        Raises:
+            Exception: If any of the evaluations failed; the completed ones are still cached
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        cache_keys = [
+            self._cache.key(_endpoint_for(item), item) if use_cache else None
+            for item in items
+        ]
         
-        task_data = response.json()
-        evaluation_id = task_data["evaluation_id"]
+        pending = []
+        for index, cache_key in enumerate(cache_keys):
+            cached = self._cache.get(cache_key) if cache_key is not None else None
+            if cached is None:
+                pending.append(index)
+            else:
+                results[index] = cached
         
-        if not wait_for_result:
-            return task_data
+        concurrency = max_concurrency or self.max_concurrency
+        chunk_size = min(-(-concurrency // _BATCH_CHUNKS_IN_FLIGHT), _BATCH_MAX_ITEMS)
+        # Limit the chunks in flight to keep at most max_concurrency evaluations running
+        semaphore = asyncio.Semaphore(max(1, concurrency // chunk_size))
         
-        # Wait for the result
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            status_data = self.get_status(evaluation_id)
-            if status_data["status"] == "COMPLETED":
-                return status_data
-            elif status_data["status"] == "FAILED":
+        async def evaluate_chunk(chunk: List[int]) -> None:
+            async with semaphore:
+                chunk_results = await self.evaluate_batch([items[index] for index in chunk], timeout)
+            for index, status_data in zip(chunk, chunk_results):
+                if status_data["status"] == "COMPLETED" and cache_keys[index] is not None:
+                    self._cache.put(cache_keys[index], status_data)
+                results[index] = status_data
+        
+        await asyncio.gather(*(
+            evaluate_chunk(pending[start:start + chunk_size])
+            for start in range(0, len(pending), chunk_size)
+        ))
+        
+        for status_data in results:
+            if status_data["status"] == "FAILED":
                 raise Exception(f"Evaluation failed: {status_data.get('error_message')}")
+        
+        return results
+    
+    async def evaluate_batch(self, items: List[Dict[str, Any]], timeout: int = 60) -> List[Dict[str, Any]]:
+        """
+        Run several evaluations in a single request to the adapter's batch endpoint.
+        
+        Args:
+            items: Request bodies for the single_response or pairwise_comparison endpoint
+                (at most the adapter's BATCH_MAX_ITEMS)
+            timeout: Timeout in seconds for the whole batch
             
-            time.sleep(1)
+        Returns:
+            Evaluation responses, completed or failed, in the same order as items
+        """
+        payloads = [await self._prepare(item) for item in items]
+        results = await self._post_batch(payloads, timeout)
         
-        raise TimeoutError(f"Evaluation timed out after {timeout} seconds")
+        # Resend items whose registered template is missing on the adapter with inline segments
+        retry = [
+            index for index, (item, payload, status_data) in enumerate(zip(items, payloads, results))
+            if payload is not item and _is_missing_template_error(status_data.get("error_message"))
+        ]
+        if retry:
+            for index in retry:
+                self._forget_template(items[index])
+            for index, status_data in zip(retry, await self._post_batch([items[index] for index in retry], timeout)):
+                results[index] = status_data
+        
+        return results
+    
+    async def _post_batch(self, payloads: List[Dict[str, Any]], timeout: int) -> List[Dict[str, Any]]:
+        """Post prepared request bodies to the batch endpoint and return its results."""
+        response = await self._client.post(
+            f"{self.base_url}/evaluate/batch",
+            content=orjson.dumps({"items": payloads}),
+            timeout=timeout
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Error: {response.status_code} - {response.text}")
+        
+        return orjson.loads(response.content)["results"]
     
-    def get_status(self, evaluation_id: str) -> Dict[str, Any]:
+    async def get_status(self, evaluation_id: str, wait: float = 0) -> Dict[str, Any]:
         """
         Get the status of an evaluation.
         
         Args:
             evaluation_id: ID of the evaluation
+            wait: Seconds the server may hold the request open waiting for the evaluation to finish
             
         Returns:
             Status response
         """
-        response = requests.get(f"{self.base_url}/evaluate/status/{evaluation_id}")
+        response = await self._client.get(
+            f"{self.base_url}/evaluate/status/{evaluation_id}",
+            params={"wait": wait} if wait else None
+        )
         
         if response.status_code != 200:
             raise Exception(f"Error: {response.status_code} - {response.text}")
         
-        return response.json()
+        return orjson.loads(response.content)
     
-    def create_custom_template(
+    async def stream_status(self, evaluation_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the status transitions of an evaluation as they happen.
+        
+        Uses the adapter's Server-Sent Events endpoint, so a single connection
+        is held open for the whole evaluation.
+        
+        Args:
+            evaluation_id: ID of the evaluation
+            
+        Yields:
+            Status responses, ending with the COMPLETED or FAILED one
+        """
+        async with self._client.stream(
+            "GET",
+            f"{self.base_url}/evaluate/events/{evaluation_id}",
+            timeout=None
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Error: {response.status_code} - {response.text}")
+            
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    yield orjson.loads(line[len("data: "):])
+    
+    async def stream_evaluate(self, item: Dict[str, Any]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run an evaluation and stream the judge output as it is generated.
+        
+        Closing the stream early (e.g. with aclose() once the judgment is known)
+        disconnects from the adapter, which stops the judge's generation.
+        
+        Args:
+            item: Request body for the single_response or pairwise_comparison endpoint
+            
+        Yields:
+            ("token", {"delta": ...}) for every piece of judge output, then
+            ("result", result) with the parsed evaluation result
+            
+        Raises:
+            Exception: If the evaluation failed
+        """
+        payload = await self._prepare(item)
+        while True:
+            async with self._client.stream(
+                "POST",
+                f"{self.base_url}/evaluate/stream",
+                content=orjson.dumps(payload),
+                timeout=None
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    # The registered template is missing on the adapter, so send the segments inline
+                    if payload is not item and _is_missing_template_error(response.text):
+                        self._forget_template(item)
+                        payload = item
+                        continue
+                    raise Exception(f"Error: {response.status_code} - {response.text}")
+                
+                event = "message"
+                async for line in response.aiter_lines():
+                    if line.startswith("event: "):
+                        event = line[len("event: "):]
+                    elif line.startswith("data: "):
+                        data = orjson.loads(line[len("data: "):])
+                        if event == "error":
+                            raise Exception(f"Evaluation failed: {data['error']}")
+                        yield event, data
+                        event = "message"
+                return
+    
+    async def stream_label(self, item: Dict[str, Any], labels: List[str]) -> Optional[str]:
+        """
+        Stream an evaluation only until the judge has output one of the given labels.
+        
+        For judgments that are a single label (e.g. 'TOXIC' or 'NON-TOXIC'), this
+        returns as soon as the label has been generated and stops the judge from
+        generating its remaining output, such as the reasoning.
+        
+        Args:
+            item: Request body for the single_response or pairwise_comparison endpoint
+            labels: Labels the judge is instructed to answer with
+            
+        Returns:
+            The first label in the judge output, or None if it contained none
+        """
+        # Longer labels first, so 'NON-TOXIC' is not read as 'TOXIC'
+        pattern = re.compile(
+            r"\b(" + "|".join(re.escape(label) for label in sorted(labels, key=len, reverse=True)) + r")\b"
+        )
+        output = ""
+        stream = self.stream_evaluate(item)
+        try:
+            async for event, data in stream:
+                if event == "result":
+                    match = pattern.search(data["raw_judge_output"])
+                    return match.group(1) if match else None
+                
+                output += data["delta"]
+                match = pattern.search(output)
+                # Only trust a match once more output follows it, as the label may still be growing
+                if match and match.end() < len(output):
+                    return match.group(1)
+        finally:
+            await stream.aclose()
+        
+        return None
+    
+    async def create_custom_template(
         self,
         template_name: str,
         system_message: str,
@@ -366,55 +1185,154 @@ class VLLMJudgeClient:
         Returns:
             Created template
         """
-        prompt_structure = {
-            "system_message": system_message,
-            "user_instruction_prefix": user_instruction_prefix,
-        }
+        template_data = _template_request(
+            template_name,
+            system_message,
+            user_instruction_prefix,
+            user_instruction_suffix,
+            output_parser_rules,
+            target_judge_model_family,
+            description,
+        )
         
-        if user_instruction_suffix:
-            prompt_structure["user_instruction_suffix"] = user_instruction_suffix
+        response = await self._client.post(
+            f"{self.base_url}/config/judge_templates",
+            content=orjson.dumps(template_data)
+        )
         
-        template_data = {
-            "template_name": template_name,
-            "prompt_structure": prompt_structure,
-        }
+        if response.status_code != 200:
+            raise Exception(f"Error: {response.status_code} - {response.text}")
         
-        if output_parser_rules:
-            template_data["output_parser_rules"] = output_parser_rules
+        return orjson.loads(response.content)
+    
+    async def list_templates(self) -> List[Dict[str, Any]]:
+        """
+        List the prompt templates available on the adapter.
         
-        if target_judge_model_family:
-            template_data["target_judge_model_family"] = target_judge_model_family
+        Returns:
+            List of templates
+        """
+        response = await self._client.get(f"{self.base_url}/config/judge_templates")
         
-        if description:
-            template_data["description"] = description
+        if response.status_code != 200:
+            raise Exception(f"Error: {response.status_code} - {response.text}")
         
-        response = requests.post(
-            f"{self.base_url}/config/judge_templates",
-            json=template_data
+        return orjson.loads(response.content)
+    
+    async def _registered_template_id(self, template: Dict[str, Any]) -> str:
+        """Get the ID of a registered template, finding or creating it on first use."""
+        template_name = template["template_name"]
+        template_id = self._template_ids.get(template_name)
+        if template_id is not None:
+            return template_id
+        
+        # Concurrent evaluations wait for a single registration
+        async with self._template_lock:
+            template_id = self._template_ids.get(template_name)
+            if template_id is None:
+                template_id = next(
+                    (t["template_id"] for t in await self.list_templates() if t["template_name"] == template_name),
+                    None,
+                )
+                if template_id is None:
+                    template_id = (await self.create_custom_template(**template))["template_id"]
+                self._template_ids[template_name] = template_id
+        return template_id
+    
+    async def _prepare(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Swap custom segments that have a registered template for the template's ID."""
+        template = _registered_template_for(payload)
+        if template is None:
+            return payload
+        return _with_template_id(payload, await self._registered_template_id(template))
+    
+    def _forget_template(self, payload: Dict[str, Any]) -> None:
+        """Drop the cached ID of the template registered for the request's custom segments."""
+        template = _registered_template_for(payload)
+        if template is not None:
+            self._template_ids.pop(template["template_name"], None)
+    
+    async def _submit(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        wait_for_result: bool,
+        timeout: int,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Submit an evaluation request and optionally wait for its result."""
+        cache_key = self._cache.key(endpoint, payload) if wait_for_result and use_cache else None
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        prepared = await self._prepare(payload)
+        status_data = await self._evaluate(endpoint, prepared, wait_for_result, timeout)
+        
+        # The template was deleted, or this adapter worker never loaded it,
+        # so send the segments inline and register it again next time
+        if prepared is not payload and _is_missing_template_error(status_data.get("error_message")):
+            self._forget_template(payload)
+            status_data = await self._evaluate(endpoint, payload, wait_for_result, timeout)
+        
+        if not wait_for_result:
+            return status_data
+        
+        if status_data["status"] == "FAILED":
+            raise Exception(f"Evaluation failed: {status_data.get('error_message')}")
+        
+        if cache_key is not None:
+            self._cache.put(cache_key, status_data)
+        return status_data
+    
+    async def _evaluate(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        wait_for_result: bool,
+        timeout: int
+    ) -> Dict[str, Any]:
+        """Post an evaluation request and optionally wait until it completes or fails."""
+        response = await self._client.post(
+            f"{self.base_url}/evaluate/{endpoint}",
+            content=orjson.dumps(payload)
         )
         
         if response.status_code != 200:
             raise Exception(f"Error: {response.status_code} - {response.text}")
         
-        return response.json()
+        task_data = orjson.loads(response.content)
+        
+        if not wait_for_result:
+            return task_data
+        
+        return await self._await_result(task_data["evaluation_id"], timeout)
+    
+    async def _await_result(self, evaluation_id: str, timeout: int) -> Dict[str, Any]:
+        """Long-poll the status of an evaluation until it completes, fails or times out."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = _POLL_INITIAL_DELAY
+        while loop.time() < deadline:
+            wait = min(deadline - loop.time(), _LONG_POLL_SECONDS)
+            polled_at = loop.time()
+            status_data = await self.get_status(evaluation_id, wait=wait)
+            if status_data["status"] in ("COMPLETED", "FAILED"):
+                return status_data
+            
+            # The adapter did not hold the request, so back off before asking again
+            if loop.time() - polled_at < wait:
+                await asyncio.sleep(max(0, min(delay, deadline - loop.time())))
+                delay = min(delay * _POLL_BACKOFF_FACTOR, _POLL_MAX_DELAY)
+        
+        raise TimeoutError(f"Evaluation timed out after {timeout} seconds")
 
 
 # Example usage
-if __name__ == "__main__":
-    # Initialize the client
-    client = VLLMJudgeClient()
-    
-    # Example 1: Toxicity detection
-    print("\n=== Example 1: Toxicity Detection ===")
-    toxic_result = client.evaluate_toxicity(
-        "This product is terrible and the customer service is even worse."
-    )
-    print(f"Judgment: {toxic_result['result']['judgment']}")
-    if toxic_result['result'].get('reasoning'):
-        print(f"Reasoning: {toxic_result['result']['reasoning']}")
-    
-    # Example 2: Factual accuracy check
-    print("\n=== Example 2: Factual Accuracy Check ===")
+async def main() -> None:
+    toxic_text = "This product is terrible and the customer service is even worse."
+    
     reference_info = """
     The Golden Gate Bridge is a suspension bridge spanning the Golden Gate, the one-mile-wide strait connecting San Francisco Bay and the Pacific Ocean. The structure links the American city of San Francisco, California to Marin County. It was opened in 1937 and had the world's longest main span of 4,200 feet (1,280 m) until the Verrazzano-Narrows Bridge in New York City was built in 1964. The Golden Gate Bridge's clearance above high water averages 220 feet (67 m), and its towers rise to 746 feet (227 m) above the water.
     """
@@ -423,14 +1341,6 @@ if __name__ == "__main__":
     The Golden Gate Bridge is located in San Francisco and was completed in 1938. It has a main span of 4,200 feet and is painted bright red. The bridge is considered one of the most beautiful bridges in the world and is a major tourist attraction.
     """
     
-    accuracy_result = client.evaluate_factual_accuracy(
-        text_to_check,
-        reference_info
-    )
-    print(f"Result: {accuracy_result['result']['judgment']}")
-    
-    # Example 3: Hallucination detection
-    print("\n=== Example 3: Hallucination Detection ===")
     source_info = """
     The Eiffel Tower is a wrought-iron lattice tower on the Champ de Mars in Paris, France. It is named after the engineer Gustave Eiffel, whose company designed and built the tower. Constructed from 1887 to 1889 as the entrance to the 1889 World's Fair, it was initially criticized by some of France's leading artists and intellectuals for its design, but it has become a global cultural icon of France. The Eiffel Tower is the most-visited paid monument in the world; 6.91 million people ascended it in 2015. The tower is 330 metres (1,083 ft) tall, about the same height as an 81-storey building, and the tallest structure in Paris.
     """
@@ -439,25 +1349,9 @@ if __name__ == "__main__":
     The Eiffel Tower, designed by Gustave Eiffel and completed in 1889, stands as Paris's most iconic landmark. At 330 meters tall, it was the world's tallest building until 1930 when the Empire State Building surpassed it. Made of approximately 18,000 iron pieces and 2.5 million rivets, the tower was almost demolished in 1909 but was saved because of its value as a radio transmission tower. During World War II, when Hitler visited Paris, the elevator cables were cut so he would have to climb the stairs if he wanted to reach the top. Today, the tower is repainted every seven years, requiring 60 tons of paint.
     """
     
-    hallucination_result = client.detect_hallucinations(
-        generated_text,
-        source_info
-    )
-    print(f"Result: {hallucination_result['result']['judgment']}")
-    
-    # Example 4: Evaluate conversational AI response
-    print("\n=== Example 4: Evaluate Conversational AI Response ===")
     user_query = "Can you explain quantum computing in simple terms?"
     ai_response = "Quantum computing is like having a super-powerful calculator that can try many answers at once instead of one at a time. It uses special particles that can exist in multiple states simultaneously, which allows it to solve certain problems much faster than regular computers. Think of it as being able to check all paths through a maze at the same time, rather than trying one path after another."
     
-    response_eval_result = client.evaluate_conversational_ai_response(
-        user_query,
-        ai_response
-    )
-    print(f"Result: {response_eval_result['result']['judgment']}")
-    
-    # Example 5: Compare summarizations
-    print("\n=== Example 5: Compare Summarizations ===")
     original_text = """
     Artificial intelligence (AI) is intelligence demonstrated by machines, as opposed to natural intelligence displayed by animals including humans. AI research has been defined as the field of study of intelligent agents, which refers to any system that perceives its environment and takes actions that maximize its chance of achieving its goals. The term "artificial intelligence" had previously been used to describe machines that mimic and display "human" cognitive skills that are associated with the human mind, such as "learning" and "problem-solving". This definition has since been rejected by major AI researchers who now describe AI in terms of rationality and acting rationally, which does not limit how intelligence can be articulated.
     
@@ -470,30 +1364,72 @@ if __name__ == "__main__":
     
     summary_B = "Artificial intelligence refers to computer systems that can perform tasks requiring human-like intelligence. These systems use algorithms to learn from data, recognize patterns, and make decisions. AI has applications in various fields including healthcare, finance, transportation, and entertainment. The field continues to evolve rapidly with advances in machine learning and neural networks."
     
-    compare_result = client.compare_summarizations(
-        original_text,
-        summary_A,
-        summary_B
-    )
-    print(f"Result: {compare_result['result']['judgment']}")
-    
-    # Example 6: Create a custom template
-    print("\n=== Example 6: Create Custom Template ===")
-    template_result = client.create_custom_template(
-        template_name="Code Quality Evaluation",
-        system_message="You are an expert software developer. Your task is to evaluate the quality of the provided code.",
-        user_instruction_prefix="Please evaluate the following code for quality, readability, efficiency, and best practices:\n\n{evaluation_criteria}\n\nCode to evaluate:\n\n",
-        user_instruction_suffix="\n\n{output_format_instruction}",
-        output_parser_rules={
-            "type": "json",
-            "format": {
-                "quality_score": "number (1-5)",
-                "readability": "number (1-5)",
-                "efficiency": "number (1-5)",
-                "adheres_to_best_practices": "boolean",
-                "suggestions": "array of strings"
-            }
-        },
-        description="Template for evaluating code quality"
-    )
-    print(f"Created template: {template_result['template_id']} - {template_result['template_name']}")
\ No newline at end of file
+    judge_model_id = "mistralai/Mistral-7B-Instruct-v0.2"
+    
+    async with AsyncVLLMJudgeClient() as client:
+        # All six examples run together, so the judge server can batch the evaluations
+        (
+            (
+                toxic_result,
+                accuracy_result,
+                hallucination_result,
+                response_eval_result,
+                compare_result,
+            ),
+            template_result,
+        ) = await asyncio.gather(
+            client.batch_evaluate([
+                _toxicity_request(toxic_text, judge_model_id, True),
+                _factual_accuracy_request(text_to_check, reference_info, judge_model_id),
+                _hallucination_request(generated_text, source_info, judge_model_id),
+                _conversational_ai_request(user_query, ai_response, judge_model_id),
+                _summary_comparison_request(original_text, summary_A, summary_B, judge_model_id),
+            ]),
+            client.create_custom_template(
+                template_name="Code Quality Evaluation",
+                system_message="You are an expert software developer. Your task is to evaluate the quality of the provided code.",
+                user_instruction_prefix="Please evaluate the following code for quality, readability, efficiency, and best practices:\n\n{evaluation_criteria}\n\nCode to evaluate:\n\n",
+                user_instruction_suffix="\n\n{output_format_instruction}",
+                output_parser_rules={
+                    "type": "json",
+                    "format": {
+                        "quality_score": "number (1-5)",
+                        "readability": "number (1-5)",
+                        "efficiency": "number (1-5)",
+                        "adheres_to_best_practices": "boolean",
+                        "suggestions": "array of strings"
+                    }
+                },
+                description="Template for evaluating code quality"
+            )
+        )
+        
+        # Example 1: Toxicity detection
+        print("\n=== Example 1: Toxicity Detection ===")
+        print(f"Judgment: {toxic_result['result']['judgment']}")
+        if toxic_result['result'].get('reasoning'):
+            print(f"Reasoning: {toxic_result['result']['reasoning']}")
+        
+        # Example 2: Factual accuracy check
+        print("\n=== Example 2: Factual Accuracy Check ===")
+        print(f"Result: {accuracy_result['result']['judgment']}")
+        
+        # Example 3: Hallucination detection
+        print("\n=== Example 3: Hallucination Detection ===")
+        print(f"Result: {hallucination_result['result']['judgment']}")
+        
+        # Example 4: Evaluate conversational AI response
+        print("\n=== Example 4: Evaluate Conversational AI Response ===")
+        print(f"Result: {response_eval_result['result']['judgment']}")
+        
+        # Example 5: Compare summarizations
+        print("\n=== Example 5: Compare Summarizations ===")
+        print(f"Result: {compare_result['result']['judgment']}")
+        
+        # Example 6: Create a custom template
+        print("\n=== Example 6: Create Custom Template ===")
+        print(f"Created template: {template_result['template_id']} - {template_result['template_name']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())